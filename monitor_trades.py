@@ -7,70 +7,375 @@ Trade Strategy Monitor
 
 import re
 import time
+import select
 import subprocess
 import os
+import signal
 from datetime import datetime
-from collections import defaultdict, Counter
+from collections import defaultdict, deque, Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
 
 LOG_FILE = '/tmp/backend.log'
 REPORT_FILE = '/Users/jongkwankim/my-work/working/TRADE_MONITOR_REPORT.md'
 CHECK_INTERVAL = 15 * 60  # 15분
+LOG_REWATCH_INTERVAL = 5  # 로그 파일이 교체된 뒤 새 파일이 생길 때까지 재구독을 시도하는 간격(초)
+LOG_CHUNK_SIZE = 1024 * 1024  # 1MB 단위로 읽어 메모리 사용량을 청크 크기로 제한
+SCAN_WORKERS = min(4, os.cpu_count() or 1)  # 청크 병렬 스캔 프로세스 수
+
+# 패턴 문법은 역참조/lookaround 없이 쓰고 가변 길이 간격은 [^\n]으로 한 줄 안에 제한
+# (백트래킹 비용이 줄 길이로 묶임). 단, 카운트는 sre 전용 기능에 의존한다 - count_chunk가
+# 분기 끝의 빈 태그 그룹과 pattern.groups/groupindex, m.lastindex/lastgroup로 분기를 식별하므로
+# re2.Set 같은 다른 엔진으로 바꾸려면 이 함수뿐 아니라 count_chunk와 패턴 구성도 다시 써야 한다
+def _compile(pattern):
+    """UTF-8 로그를 디코딩 없이 바이트 그대로 스캔하도록 bytes 정규식으로 컴파일"""
+    return re.compile(pattern.encode('utf-8'))
+
+# 스캔마다 re 캐시를 조회하지 않도록 모든 패턴을 모듈 로드 시 미리 컴파일
+# 심각한 오류: (원인, 리터럴, 대소문자 무시 여부, 확인용 정규식)
+# 하나로 합친 alternation은 분기마다 매 위치를 시도해 느리므로, 리터럴 포함 여부를
+# bytes `in`(memchr 기반)으로 먼저 거르고 간격이 있는 패턴만 정규식으로 확인
+# 대문자 고정 토큰은 대소문자를 구분하고, 문장형 메시지만 소문자로 변환한 로그에서 찾는다
+_CRITICAL_ERRORS = [
+    ('ECONNREFUSED', b'ECONNREFUSED', False, None),
+    ('DB_CONNECTION', b'cannot connect to', True, _compile(r'cannot connect to[^\n]*database')),
+    ('UNHANDLED_REJECTION', b'UnhandledPromiseRejectionWarning', False, None),
+    ('TYPE_ERROR', b'TypeError:', False, None),
+    ('REFERENCE_ERROR', b'ReferenceError:', False, None),
+    ('FATAL_ERROR', b'fatal error', True, None),
+    ('SIGTERM', b'SIGTERM', False, None),
+    ('SIGKILL', b'SIGKILL', False, None),
+]
+
+# 전략별 패턴을 첫 글자(공통 리터럴 접두사)별 alternation으로 묶어 컴파일
+# - 하나로 합친 거대 정규식보다 리터럴로 시작하는 여러 정규식이 sre의 접두사 검색 경로를 탄다
+# - 각 분기 끝의 빈 named group(m.lastgroup)으로 어떤 패턴이 매치됐는지 식별
+#   (분기 전체를 그룹으로 감싸면 첫 글자 charset 최적화가 꺼져 훨씬 느려짐)
+# - 분기 없는 고정 문자열은 *_LITERALS로 분리해 정규식 대신 bytes.count로 센다
+# Cycle Rider
+_CYCLE_RIDER_PATTERNS = [
+    _compile(
+        r'\[(?:Distribution\] \w+ (?:Starting analysis(?P<dist_analyzed>)'
+        r'|🎯 Distribution zone detected(?P<dist_detected>))'
+        r'|SqueezeMomentum\] \w+ (?:Starting analysis(?P<squeeze_analyzed>)'
+        r'|✅ Squeeze detected(?P<squeeze_detected>))'
+        r'|CycleRider\] \w+ 🚀 Cycle Rider signal(?P<signal>))'
+    ),
+    _compile(
+        r'No(?:t in (?:distribution \(price not near POC\)(?P<dist_not_near_poc>)'
+        r'|squeeze(?P<squeeze_not_in_squeeze>))'
+        r'| accumulation pattern(?P<dist_no_accumulation>)'
+        r'| momentum divergence(?P<squeeze_no_divergence>))'
+    ),
+]
+_CYCLE_RIDER_LITERALS = [
+    (b'Volume spike too strong', 'dist_volume_spike'),
+    (b'CVD slope too negative', 'dist_cvd_negative'),
+    (b'Histogram not bullish', 'squeeze_histogram'),
+]
+_CR_DIST_FILTERS = [
+    ('dist_not_near_poc', 'Not near POC'),
+    ('dist_volume_spike', 'Volume spike'),
+    ('dist_cvd_negative', 'CVD negative'),
+    ('dist_no_accumulation', 'No accumulation'),
+]
+_CR_SQUEEZE_FILTERS = [
+    ('squeeze_not_in_squeeze', 'Not in squeeze'),
+    ('squeeze_no_divergence', 'No divergence'),
+    ('squeeze_histogram', 'Histogram not bullish'),
+]
+
+# Hour Swing
+_HOUR_SWING_PATTERNS = [
+    _compile(
+        r'\[(?:MTF Alignment\] \w+ (?:Checking alignment(?P<mtf_analyzed>)'
+        r'|✅[^\n]*?aligned(?P<mtf_detected>))'
+        r'|RelativeStrength\] \w+ (?:Checking relative strength(?P<rs_analyzed>)'
+        r'|✅ Relative strength confirmed(?P<rs_detected>))'
+        r'|FundingExtremes\] \w+ (?:Starting analysis(?P<fe_analyzed>)'
+        r'|💥 Extreme funding detected(?P<fe_detected>)'
+        r'|🔥 EXTREME zScore detected(?P<fe_extreme_bypass>))'
+        r'|HourSwing\] \w+ 🎯[^\n]*?signal generated(?P<signal>))'
+    ),
+    _compile(
+        r'1(?:H analysis: valid=false(?P<mtf_1h_invalid>)'
+        r'|5M analysis: aligned=false(?P<mtf_15m_not_aligned>))'
+    ),
+    _compile(
+        r'BTC b(?:earish cross detected(?P<rs_btc_bearish>)'
+        r'|ullish cross detected(?P<rs_btc_bullish>))'
+    ),
+    _compile(
+        r'M(?:arket structure break: broken=false(?P<fe_not_broken>)'
+        r'|omentum slowing: false(?P<fe_not_slowing>))'
+    ),
+]
+_HOUR_SWING_LITERALS = [
+    (b'strength=0.00', 'mtf_too_weak'),
+    (b'Altcoin weaker than BTC', 'rs_weaker'),
+    (b'isExtreme=false', 'fe_not_extreme'),
+]
+_HS_MTF_FILTERS = [
+    ('mtf_1h_invalid', '1H trend invalid'),
+    ('mtf_15m_not_aligned', '15M not aligned'),
+    ('mtf_too_weak', 'Trend too weak'),
+]
+_HS_RS_FILTERS = [
+    ('rs_btc_bearish', 'BTC bearish'),
+    ('rs_btc_bullish', 'BTC bullish'),
+    ('rs_weaker', 'Weaker than BTC'),
+]
+_HS_FE_FILTERS = [
+    ('fe_not_broken', 'Structure not broken'),
+    ('fe_not_slowing', 'Momentum not slowing'),
+    ('fe_not_extreme', 'Funding not extreme'),
+]
+
+# Box Range
+_BOX_RANGE_PATTERNS = [
+    _compile(
+        r'\[Box(?:Detector\] \w+ ✅ Box detected! Grade='
+        r'(?:A(?P<grade_A>)|B(?P<grade_B>)|C(?P<grade_C>))'
+        r'|RangeSignal\] \w+ (?:Starting box range analysis(?P<entry_analyzed>)'
+        r'|🎯 Box Range signal generated(?P<signal>)))'
+    ),
+    _compile(
+        r'Failed (?:ATR filter(?P<atr>)'
+        r'|upper timeframe filter(?P<upper_tf>))'
+    ),
+]
+_BOX_RANGE_LITERALS = [
+    (b'1H ADX too high', 'adx'),
+    (b'Box invalidated by price breakout', 'breakout'),
+    (b'Symbol disabled', 'symbol_disabled'),
+]
+_BR_FILTERS = [
+    ('atr', 'ATR out of range'),
+    ('adx', 'ADX too high'),
+    ('upper_tf', 'Upper TF failed'),
+    ('breakout', 'Box breakout'),
+    ('symbol_disabled', 'Symbol disabled'),
+]
+
+_STRATEGY_PATTERNS = [
+    ('cycle_rider', _CYCLE_RIDER_PATTERNS, _CYCLE_RIDER_LITERALS),
+    ('hour_swing', _HOUR_SWING_PATTERNS, _HOUR_SWING_LITERALS),
+    ('box_range', _BOX_RANGE_PATTERNS, _BOX_RANGE_LITERALS),
+]
+
+# 주문: (리터럴, 키, 확인용 정규식) - 같은 줄에 심볼(\w+USDT)이 있어야 카운트
+# (메타데이터가 다음 줄에 찍히는 동명 로그 제외), 리터럴이 없는 청크는 정규식 생략
+_ORDER_EVENTS = [
+    (b'Order placed', 'orders_placed', _compile(r'Order placed[^\n]*\wUSDT')),
+    (b'Order filled', 'orders_filled', _compile(r'Order filled[^\n]*\wUSDT')),
+    (b'Order cancelled', 'orders_cancelled', _compile(r'Order cancelled[^\n]*\wUSDT')),
+    (b'Position opened', 'positions_opened', _compile(r'Position opened[^\n]*\wUSDT')),
+    (b'Position closed', 'positions_closed', _compile(r'Position closed[^\n]*\wUSDT')),
+]
+
+# 로그 레벨 (ANSI 색상 코드, ESC 문자가 제거된 로그도 허용, 매치는 줄 끝까지로 제한)
+# error/warn을 한 번의 스캔으로 찾고 태그 그룹으로 구분
+_LEVEL_LINE = _compile(r'\[3(?:1merror(?P<errors>)|3mwarn(?P<warnings>))\x1b?\[39m[^\n]*')
+# 리포트에 남길 샘플에서만 색상 코드 제거 (ESC 없는 형태는 레벨 색상 코드만 - `[15m]` 같은 본문 보존)
+_ANSI_ESCAPE = _compile(r'\x1b\[[0-9;]*m|\[3[139]m')
+
+def _scan_chunk(chunk):
+    """청크 하나의 오류 체크와 패턴 카운트 (프로세스 풀 워커에서 실행)"""
+    counts = defaultdict(Counter)
+    samples = defaultdict(list)
+    has_error, error_pattern = TradeMonitor.check_for_errors(chunk)
+    if not has_error:
+        TradeMonitor.count_chunk(chunk, counts, samples)
+    return has_error, error_pattern, counts, samples
 
 class TradeMonitor:
     def __init__(self):
         self.last_position = 0
         self.iteration = 0
+        self._report_fp = None
+        self._log_watch = None
+        self._log_replaced = False
+        # 코어가 하나뿐이면 프로세스 간 전송 비용만 늘어나므로 풀 없이 직접 스캔
+        # 워커는 SIGINT를 무시 (Ctrl-C 종료는 메인 프로세스만 처리하고 풀은 shutdown으로 정리)
+        self._pool = ProcessPoolExecutor(
+            max_workers=SCAN_WORKERS,
+            initializer=signal.signal,
+            initargs=(signal.SIGINT, signal.SIG_IGN),
+        ) if SCAN_WORKERS > 1 else None
 
     def stop_server(self):
         """서버 중단"""
         print(f"🚨 [{datetime.now().strftime('%H:%M:%S')}] STOPPING SERVER DUE TO ERROR...")
+        # pkill 한 번으로 프로세스 검색과 SIGTERM 전송을 처리 (셸을 거치지 않음)
         subprocess.run(['pkill', '-f', 'node.*dual-strategy'], check=False)
-        subprocess.run(['lsof', '-ti:3031'], capture_output=True, text=True, check=False)
         print(f"✅ [{datetime.now().strftime('%H:%M:%S')}] Server stopped")
 
-    def read_new_logs(self):
-        """마지막 위치부터 새 로그 읽기"""
+    def watch_log(self):
+        """로그 파일 쓰기 이벤트를 kqueue로 구독 (kqueue가 없는 플랫폼이면 None)"""
+        if not hasattr(select, 'kqueue'):
+            return None
         try:
-            with open(LOG_FILE, 'r', encoding='utf-8', errors='ignore') as f:
+            # 읽기 가능한 fd로 열어 두어야 파일이 교체돼도 기존 inode의 남은 줄을 마저 읽을 수 있다
+            fd = os.open(LOG_FILE, os.O_RDONLY)
+        except OSError as e:
+            print(f"⚠️  Log watch unavailable, retrying every {LOG_REWATCH_INTERVAL}s: {e}")
+            return None
+        kq = select.kqueue()
+        # EV_CLEAR: 스캔 도중 들어온 쓰기도 다음 대기에서 한 번에 받는다
+        kq.control([select.kevent(
+            fd,
+            filter=select.KQ_FILTER_VNODE,
+            flags=select.KQ_EV_ADD | select.KQ_EV_CLEAR,
+            fflags=(select.KQ_NOTE_WRITE | select.KQ_NOTE_EXTEND
+                    | select.KQ_NOTE_DELETE | select.KQ_NOTE_RENAME),
+        )], 0)
+        return kq, fd
+
+    def unwatch_log(self):
+        """로그 파일 구독 해제"""
+        if self._log_watch is not None:
+            kq, fd = self._log_watch
+            kq.close()
+            os.close(fd)
+            self._log_watch = None
+
+    def wait_for_log(self, timeout):
+        """로그에 새 쓰기가 있거나 timeout(초)이 지날 때까지 대기"""
+        if not hasattr(select, 'kqueue'):
+            time.sleep(timeout)
+            return
+
+        # 구독이 끊긴 상태(파일 교체 후 아직 새 파일이 없음 등)면 새 파일이 생길 때까지 짧게 재시도
+        deadline = time.monotonic() + timeout
+        while self._log_watch is None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(min(remaining, LOG_REWATCH_INTERVAL))
+            if os.path.exists(LOG_FILE):
+                self._log_watch = self.watch_log()
+                if self._log_watch is not None:
+                    # 새 파일에 이미 쓰인 내용은 이벤트가 오지 않으므로 대기하지 않고 바로 스캔
+                    return
+
+        events = self._log_watch[0].control(None, 1, max(0, deadline - time.monotonic()))
+        if events and events[0].fflags & (select.KQ_NOTE_DELETE | select.KQ_NOTE_RENAME):
+            # 삭제 후 재생성/로테이션: 기존 inode 구독은 더 이상 이벤트가 오지 않으므로
+            # 다음 스캔에서 기존 파일의 남은 줄을 읽은 뒤 새 파일로 전환 (iter_new_lines)
+            print(f"🔄 [{datetime.now().strftime('%H:%M:%S')}] Log file replaced, re-watching {LOG_FILE}")
+            self._log_replaced = True
+
+    def iter_new_lines(self):
+        """마지막 위치부터 새 로그를 완성된 줄 단위 청크로 읽기 (미완성 마지막 줄은 다음 스캔에서 처리)"""
+        if self._log_replaced:
+            # 교체 직전에 기존 파일에 쓰인 줄을 구독 중인 fd로 마저 읽고 새 파일을 처음부터 구독
+            yield from self._read_lines(self._log_watch[1])
+            self._log_replaced = False
+            self.unwatch_log()
+            self.last_position = 0
+            if os.path.exists(LOG_FILE):
+                self._log_watch = self.watch_log()
+        yield from self._read_lines(LOG_FILE)
+
+    def _read_lines(self, source):
+        """경로 또는 열린 fd(source)에서 last_position 이후의 완성된 줄을 청크 단위로 읽기"""
+        try:
+            with open(source, 'rb', closefd=not isinstance(source, int)) as f:
+                # 제자리에서 잘린 로그(`> /tmp/backend.log`로 서버 재시작)는 처음부터 다시 읽는다
+                if os.fstat(f.fileno()).st_size < self.last_position:
+                    print(f"🔄 [{datetime.now().strftime('%H:%M:%S')}] Log file truncated, reading from start")
+                    self.last_position = 0
+                # mmap은 쓰지 않음: 서버 재시작(`> /tmp/backend.log`)으로 매핑 중인 파일이 잘리면
+                # 접근 시 SIGBUS로 인터프리터가 바로 죽어 리포트/풀 정리도 실행되지 않는다
                 f.seek(self.last_position)
-                new_content = f.read()
-                self.last_position = f.tell()
-                return new_content
+                pending = b""
+                while True:
+                    data = f.read(LOG_CHUNK_SIZE)
+                    if not data:
+                        break
+                    data = pending + data
+                    end = data.rfind(b'\n') + 1
+                    pending = data[end:]
+                    if end:
+                        self.last_position += end
+                        yield data[:end]
         except Exception as e:
             print(f"❌ Error reading log: {e}")
-            return ""
 
-    def check_for_errors(self, content):
+    @staticmethod
+    def check_for_errors(content):
         """심각한 오류 체크"""
-        error_patterns = [
-            r'ECONNREFUSED',
-            r'Cannot connect to.*database',
-            r'UnhandledPromiseRejectionWarning',
-            r'TypeError:',
-            r'ReferenceError:',
-            r'Fatal error',
-            r'SIGTERM',
-            r'SIGKILL',
-        ]
-
-        for pattern in error_patterns:
-            if re.search(pattern, content, re.IGNORECASE):
-                return True, pattern
+        lowered = None
+        for name, literal, ignore_case, confirm in _CRITICAL_ERRORS:
+            haystack = content
+            if ignore_case:
+                if lowered is None:
+                    lowered = content.lower()
+                haystack = lowered
+            if literal in haystack and (confirm is None or confirm.search(haystack)):
+                return True, name
         return False, None
 
-    def analyze_logs(self, content):
-        """로그 분석하여 통계 추출"""
+    @staticmethod
+    def count_chunk(chunk, counts, samples):
+        """청크 하나의 패턴 매치 수를 항목별 Counter에 누적"""
+        # 매치마다 태그 그룹 번호로 리스트 칸을 올리고, 이름 변환은 패턴당 한 번만
+        for key, patterns, literals in _STRATEGY_PATTERNS:
+            for pattern in patterns:
+                hits = [0] * (pattern.groups + 1)
+                for m in pattern.finditer(chunk):
+                    hits[m.lastindex] += 1
+                for name, index in pattern.groupindex.items():
+                    if hits[index]:
+                        counts[key][name] += hits[index]
+            # 고정 문자열은 Match 객체 없이 C 루프에서 바로 센다
+            for literal, name in literals:
+                counts[key][name] += chunk.count(literal)
+
+        for literal, key, pattern in _ORDER_EVENTS:
+            if literal in chunk:
+                counts['orders'][key] += len(pattern.findall(chunk))
+
+        # 레벨별로 모두 세되 샘플은 최대 10개만 보관
+        for m in _LEVEL_LINE.finditer(chunk):
+            key = m.lastgroup
+            counts['log_levels'][key] += 1
+            if len(samples[key]) < 10:
+                samples[key].append(_ANSI_ESCAPE.sub(b'', m.group()))
+
+    def scan_chunks(self, chunks):
+        """청크를 프로세스 풀에서 병렬 스캔하고 결과를 읽은 순서대로 반환
+        (동시에 제출하는 청크 수를 제한해 메모리 사용량을 청크 몇 개 크기로 유지)"""
+        chunks = iter(chunks)
+        head = list(islice(chunks, 2))
+        # 로그 쓰기마다 깨어난 평소 스캔은 청크 하나뿐이므로 전송 없이 바로 스캔하고,
+        # 풀은 여러 청크가 쌓인 백로그(시작 시 기존 로그 등)에만 사용
+        if self._pool is None or len(head) < 2:
+            for chunk in chain(head, chunks):
+                yield _scan_chunk(chunk)
+            return
+
+        in_flight = deque()
+        for chunk in chain(head, chunks):
+            in_flight.append(self._pool.submit(_scan_chunk, chunk))
+            if len(in_flight) >= SCAN_WORKERS * 2:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+    def analyze_logs(self, counts, samples):
+        """누적된 카운트로 통계 추출"""
         stats = {
             'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'cycle_rider': self.analyze_cycle_rider(content),
-            'hour_swing': self.analyze_hour_swing(content),
-            'box_range': self.analyze_box_range(content),
-            'orders': self.analyze_orders(content),
-            'errors': self.analyze_errors(content),
+            'cycle_rider': self.analyze_cycle_rider(counts['cycle_rider']),
+            'hour_swing': self.analyze_hour_swing(counts['hour_swing']),
+            'box_range': self.analyze_box_range(counts['box_range']),
+            'orders': self.analyze_orders(counts['orders']),
+            'errors': self.analyze_errors(counts['log_levels'], samples),
         }
         return stats
 
-    def analyze_cycle_rider(self, content):
+    def analyze_cycle_rider(self, counts):
         """Cycle Rider 전략 분석"""
         stats = {
             'total_scans': 0,
@@ -80,45 +385,29 @@ class TradeMonitor:
         }
 
         # Distribution 분석
-        dist_analyzed = re.findall(r'\[Distribution\] (\w+) Starting analysis', content)
-        dist_detected = re.findall(r'\[Distribution\] (\w+) 🎯 Distribution zone detected', content)
-        stats['distribution']['analyzed'] = len(dist_analyzed)
-        stats['distribution']['detected'] = len(dist_detected)
+        stats['distribution']['analyzed'] = counts['dist_analyzed']
+        stats['distribution']['detected'] = counts['dist_detected']
 
         # Distribution 필터 실패
-        for pattern, name in [
-            (r'Not in distribution \(price not near POC\)', 'Not near POC'),
-            (r'Volume spike too strong', 'Volume spike'),
-            (r'CVD slope too negative', 'CVD negative'),
-            (r'No accumulation pattern', 'No accumulation'),
-        ]:
-            count = len(re.findall(pattern, content))
-            if count > 0:
-                stats['distribution']['failed_filters'][name] = count
+        for key, name in _CR_DIST_FILTERS:
+            if counts[key] > 0:
+                stats['distribution']['failed_filters'][name] = counts[key]
 
         # Squeeze Momentum 분석
-        squeeze_analyzed = re.findall(r'\[SqueezeMomentum\] (\w+) Starting analysis', content)
-        squeeze_detected = re.findall(r'\[SqueezeMomentum\] (\w+) ✅ Squeeze detected', content)
-        stats['squeeze']['analyzed'] = len(squeeze_analyzed)
-        stats['squeeze']['detected'] = len(squeeze_detected)
+        stats['squeeze']['analyzed'] = counts['squeeze_analyzed']
+        stats['squeeze']['detected'] = counts['squeeze_detected']
 
         # Squeeze 필터 실패
-        for pattern, name in [
-            (r'Not in squeeze', 'Not in squeeze'),
-            (r'No momentum divergence', 'No divergence'),
-            (r'Histogram not bullish', 'Histogram not bullish'),
-        ]:
-            count = len(re.findall(pattern, content))
-            if count > 0:
-                stats['squeeze']['failed_filters'][name] = count
+        for key, name in _CR_SQUEEZE_FILTERS:
+            if counts[key] > 0:
+                stats['squeeze']['failed_filters'][name] = counts[key]
 
         # 시그널 생성
-        signals = re.findall(r'\[CycleRider\] (\w+) 🚀 Cycle Rider signal', content)
-        stats['signals_generated'] = len(signals)
+        stats['signals_generated'] = counts['signal']
 
         return stats
 
-    def analyze_hour_swing(self, content):
+    def analyze_hour_swing(self, counts):
         """Hour Swing 전략 분석"""
         stats = {
             'total_scans': 0,
@@ -129,62 +418,39 @@ class TradeMonitor:
         }
 
         # MTF Alignment 분석
-        mtf_analyzed = re.findall(r'\[MTF Alignment\] (\w+) Checking alignment', content)
-        mtf_detected = re.findall(r'\[MTF Alignment\] (\w+) ✅.*aligned', content)
-        stats['mtf_alignment']['analyzed'] = len(mtf_analyzed)
-        stats['mtf_alignment']['detected'] = len(mtf_detected)
+        stats['mtf_alignment']['analyzed'] = counts['mtf_analyzed']
+        stats['mtf_alignment']['detected'] = counts['mtf_detected']
 
         # MTF 필터 실패
-        for pattern, name in [
-            (r'1H analysis: valid=false', '1H trend invalid'),
-            (r'15M analysis: aligned=false', '15M not aligned'),
-            (r'strength=0\.00', 'Trend too weak'),
-        ]:
-            count = len(re.findall(pattern, content))
-            if count > 0:
-                stats['mtf_alignment']['failed_filters'][name] = count
+        for key, name in _HS_MTF_FILTERS:
+            if counts[key] > 0:
+                stats['mtf_alignment']['failed_filters'][name] = counts[key]
 
         # Relative Strength 분석
-        rs_analyzed = re.findall(r'\[RelativeStrength\] (\w+) Checking relative strength', content)
-        rs_detected = re.findall(r'\[RelativeStrength\] (\w+) ✅ Relative strength confirmed', content)
-        stats['relative_strength']['analyzed'] = len(rs_analyzed)
-        stats['relative_strength']['detected'] = len(rs_detected)
+        stats['relative_strength']['analyzed'] = counts['rs_analyzed']
+        stats['relative_strength']['detected'] = counts['rs_detected']
 
         # RS 필터 실패
-        for pattern, name in [
-            (r'BTC bearish cross detected', 'BTC bearish'),
-            (r'BTC bullish cross detected', 'BTC bullish'),
-            (r'Altcoin weaker than BTC', 'Weaker than BTC'),
-        ]:
-            count = len(re.findall(pattern, content))
-            if count > 0:
-                stats['relative_strength']['failed_filters'][name] = count
+        for key, name in _HS_RS_FILTERS:
+            if counts[key] > 0:
+                stats['relative_strength']['failed_filters'][name] = counts[key]
 
         # Funding Extremes 분석
-        fe_analyzed = re.findall(r'\[FundingExtremes\] (\w+) Starting analysis', content)
-        fe_detected = re.findall(r'\[FundingExtremes\] (\w+) 💥 Extreme funding detected', content)
-        fe_extreme_bypass = re.findall(r'\[FundingExtremes\] (\w+) 🔥 EXTREME zScore detected', content)
-        stats['funding_extremes']['analyzed'] = len(fe_analyzed)
-        stats['funding_extremes']['detected'] = len(fe_detected)
-        stats['funding_extremes']['extreme_zscore_bypass'] = len(fe_extreme_bypass)
+        stats['funding_extremes']['analyzed'] = counts['fe_analyzed']
+        stats['funding_extremes']['detected'] = counts['fe_detected']
+        stats['funding_extremes']['extreme_zscore_bypass'] = counts['fe_extreme_bypass']
 
         # FE 필터 실패
-        for pattern, name in [
-            (r'Market structure break: broken=false', 'Structure not broken'),
-            (r'Momentum slowing: false', 'Momentum not slowing'),
-            (r'isExtreme=false', 'Funding not extreme'),
-        ]:
-            count = len(re.findall(pattern, content))
-            if count > 0:
-                stats['funding_extremes']['failed_filters'][name] = count
+        for key, name in _HS_FE_FILTERS:
+            if counts[key] > 0:
+                stats['funding_extremes']['failed_filters'][name] = counts[key]
 
         # 시그널 생성
-        signals = re.findall(r'\[HourSwing\] (\w+) 🎯.*signal generated', content)
-        stats['signals_generated'] = len(signals)
+        stats['signals_generated'] = counts['signal']
 
         return stats
 
-    def analyze_box_range(self, content):
+    def analyze_box_range(self, counts):
         """Box Range 전략 분석"""
         stats = {
             'total_scans': 0,
@@ -196,36 +462,23 @@ class TradeMonitor:
         }
 
         # Box 감지
-        boxes = re.findall(r'\[BoxDetector\] (\w+) ✅ Box detected! Grade=([ABC])', content)
-        stats['boxes_detected'] = len(boxes)
-        for symbol, grade in boxes:
-            stats['box_grades'][grade] += 1
+        for grade in 'ABC':
+            if counts['grade_' + grade] > 0:
+                stats['box_grades'][grade] = counts['grade_' + grade]
+        stats['boxes_detected'] = sum(stats['box_grades'].values())
 
-        # Entry 분석
-        entry_analyzed = re.findall(r'\[BoxRangeSignal\] (\w+) Starting box range analysis', content)
-        entry_generated = re.findall(r'\[BoxRangeSignal\] (\w+) 🎯 Box Range signal generated', content)
-        stats['entry_analysis']['analyzed'] = len(entry_analyzed)
-        stats['entry_analysis']['generated'] = len(entry_generated)
+        # Entry 분석 (생성된 Entry가 곧 Box Range 시그널이므로 한 번 센 값을 공유)
+        stats['entry_analysis']['analyzed'] = counts['entry_analyzed']
+        stats['entry_analysis']['generated'] = stats['signals_generated'] = counts['signal']
 
         # 필터 실패
-        for pattern, name in [
-            (r'Failed ATR filter', 'ATR out of range'),
-            (r'1H ADX too high', 'ADX too high'),
-            (r'Failed upper timeframe filter', 'Upper TF failed'),
-            (r'Box invalidated by price breakout', 'Box breakout'),
-            (r'Symbol disabled', 'Symbol disabled'),
-        ]:
-            count = len(re.findall(pattern, content))
-            if count > 0:
-                stats['failed_filters'][name] = count
-
-        # 시그널 생성
-        signals = re.findall(r'\[BoxRangeSignal\] (\w+) 🎯 Box Range signal generated', content)
-        stats['signals_generated'] = len(signals)
+        for key, name in _BR_FILTERS:
+            if counts[key] > 0:
+                stats['failed_filters'][name] = counts[key]
 
         return stats
 
-    def analyze_orders(self, content):
+    def analyze_orders(self, counts):
         """주문 분석"""
         stats = {
             'orders_placed': 0,
@@ -235,121 +488,103 @@ class TradeMonitor:
             'positions_closed': 0,
         }
 
-        orders_placed = re.findall(r'Order placed.*(\w+USDT)', content)
-        orders_filled = re.findall(r'Order filled.*(\w+USDT)', content)
-        orders_cancelled = re.findall(r'Order cancelled.*(\w+USDT)', content)
-        positions_opened = re.findall(r'Position opened.*(\w+USDT)', content)
-        positions_closed = re.findall(r'Position closed.*(\w+USDT)', content)
-
-        stats['orders_placed'] = len(orders_placed)
-        stats['orders_filled'] = len(orders_filled)
-        stats['orders_cancelled'] = len(orders_cancelled)
-        stats['positions_opened'] = len(positions_opened)
-        stats['positions_closed'] = len(positions_closed)
+        for _, key, _ in _ORDER_EVENTS:
+            stats[key] = counts[key]
 
         return stats
 
-    def analyze_errors(self, content):
+    def analyze_errors(self, counts, samples):
         """오류 분석"""
-        errors = []
-
-        error_lines = re.findall(r'\[31merror\[39m.*', content)
-        warn_lines = re.findall(r'\[33mwarn\[39m.*', content)
-
         return {
-            'error_count': len(error_lines),
-            'warning_count': len(warn_lines),
-            'errors': error_lines[:10] if error_lines else [],  # 최대 10개만
-            'warnings': warn_lines[:10] if warn_lines else [],
+            'error_count': counts['errors'],
+            'warning_count': counts['warnings'],
+            'errors': samples['errors'],
+            'warnings': samples['warnings'],
         }
 
     def write_report(self, stats):
         """리포트 파일에 통계 기록"""
         try:
-            # 파일 존재 여부 확인
-            if self.iteration == 0 or not os.path.exists(REPORT_FILE):
-                # 첫 실행이거나 파일이 없으면 헤더 작성
-                with open(REPORT_FILE, 'w') as f:
-                    f.write(f"# Trading Strategy Monitor Report\n\n")
-                    f.write(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-                    f.write("---\n\n")
+            # 리포트 내용을 리스트에 모아 한 번에 기록
+            parts = []
+
+            # 첫 실행이면 파일을 열어 헤더 작성 (이후 스캔은 열린 핸들에 이어서 기록)
+            if self._report_fp is None:
+                self._report_fp = open(REPORT_FILE, 'w')
+                parts.append(f"# Trading Strategy Monitor Report\n\n")
+                parts.append(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+                parts.append("---\n\n")
 
             # 통계 추가
-            with open(REPORT_FILE, 'a') as f:
-                f.write(f"## Scan #{self.iteration + 1} - {stats['timestamp']}\n\n")
-
-                # Cycle Rider
-                f.write("### 🔄 Cycle Rider Strategy\n\n")
-                cr = stats['cycle_rider']
-                f.write(f"- **Distribution**: {cr['distribution']['detected']}/{cr['distribution']['analyzed']} detected\n")
-                if cr['distribution']['failed_filters']:
-                    f.write("  - Failed filters:\n")
-                    for name, count in cr['distribution']['failed_filters'].items():
-                        f.write(f"    - {name}: {count}\n")
-                f.write(f"- **Squeeze Momentum**: {cr['squeeze']['detected']}/{cr['squeeze']['analyzed']} detected\n")
-                if cr['squeeze']['failed_filters']:
-                    f.write("  - Failed filters:\n")
-                    for name, count in cr['squeeze']['failed_filters'].items():
-                        f.write(f"    - {name}: {count}\n")
-                f.write(f"- **Signals Generated**: {cr['signals_generated']}\n\n")
-
-                # Hour Swing
-                f.write("### ⏰ Hour Swing Strategy\n\n")
-                hs = stats['hour_swing']
-                f.write(f"- **MTF Alignment**: {hs['mtf_alignment']['detected']}/{hs['mtf_alignment']['analyzed']} aligned\n")
-                if hs['mtf_alignment']['failed_filters']:
-                    f.write("  - Failed filters:\n")
-                    for name, count in hs['mtf_alignment']['failed_filters'].items():
-                        f.write(f"    - {name}: {count}\n")
-                f.write(f"- **Relative Strength**: {hs['relative_strength']['detected']}/{hs['relative_strength']['analyzed']} confirmed\n")
-                if hs['relative_strength']['failed_filters']:
-                    f.write("  - Failed filters:\n")
-                    for name, count in hs['relative_strength']['failed_filters'].items():
-                        f.write(f"    - {name}: {count}\n")
-                f.write(f"- **Funding Extremes**: {hs['funding_extremes']['detected']}/{hs['funding_extremes']['analyzed']} extreme detected\n")
-                f.write(f"  - 🔥 Extreme zScore bypass: {hs['funding_extremes']['extreme_zscore_bypass']}\n")
-                if hs['funding_extremes']['failed_filters']:
-                    f.write("  - Failed filters:\n")
-                    for name, count in hs['funding_extremes']['failed_filters'].items():
-                        f.write(f"    - {name}: {count}\n")
-                f.write(f"- **Signals Generated**: {hs['signals_generated']}\n\n")
-
-                # Box Range
-                f.write("### 📦 Box Range Strategy\n\n")
-                br = stats['box_range']
-                f.write(f"- **Boxes Detected**: {br['boxes_detected']}\n")
-                if br['box_grades']:
-                    f.write("  - Grades:\n")
-                    for grade, count in sorted(br['box_grades'].items()):
-                        f.write(f"    - Grade {grade}: {count}\n")
-                f.write(f"- **Entry Analysis**: {br['entry_analysis']['generated']}/{br['entry_analysis']['analyzed']} signals\n")
-                if br['failed_filters']:
-                    f.write("  - Failed filters:\n")
-                    for name, count in br['failed_filters'].items():
-                        f.write(f"    - {name}: {count}\n")
-                f.write(f"- **Signals Generated**: {br['signals_generated']}\n\n")
-
-                # Orders
-                f.write("### 📊 Trading Activity\n\n")
-                orders = stats['orders']
-                f.write(f"- Orders Placed: {orders['orders_placed']}\n")
-                f.write(f"- Orders Filled: {orders['orders_filled']}\n")
-                f.write(f"- Positions Opened: {orders['positions_opened']}\n")
-                f.write(f"- Positions Closed: {orders['positions_closed']}\n\n")
-
-                # Errors
-                errs = stats['errors']
-                if errs['error_count'] > 0 or errs['warning_count'] > 0:
-                    f.write("### ⚠️ Errors & Warnings\n\n")
-                    f.write(f"- Errors: {errs['error_count']}\n")
-                    f.write(f"- Warnings: {errs['warning_count']}\n")
-                    if errs['errors']:
-                        f.write("\nRecent errors:\n")
-                        for err in errs['errors'][:5]:
-                            f.write(f"```\n{err}\n```\n")
-                    f.write("\n")
-
-                f.write("---\n\n")
+            parts.append(f"## Scan #{self.iteration + 1} - {stats['timestamp']}\n\n")
+
+            # Cycle Rider
+            parts.append("### 🔄 Cycle Rider Strategy\n\n")
+            cr = stats['cycle_rider']
+            parts.append(f"- **Distribution**: {cr['distribution']['detected']}/{cr['distribution']['analyzed']} detected\n")
+            if cr['distribution']['failed_filters']:
+                parts.append("  - Failed filters:\n")
+                parts.extend(f"    - {name}: {count}\n" for name, count in cr['distribution']['failed_filters'].items())
+            parts.append(f"- **Squeeze Momentum**: {cr['squeeze']['detected']}/{cr['squeeze']['analyzed']} detected\n")
+            if cr['squeeze']['failed_filters']:
+                parts.append("  - Failed filters:\n")
+                parts.extend(f"    - {name}: {count}\n" for name, count in cr['squeeze']['failed_filters'].items())
+            parts.append(f"- **Signals Generated**: {cr['signals_generated']}\n\n")
+
+            # Hour Swing
+            parts.append("### ⏰ Hour Swing Strategy\n\n")
+            hs = stats['hour_swing']
+            parts.append(f"- **MTF Alignment**: {hs['mtf_alignment']['detected']}/{hs['mtf_alignment']['analyzed']} aligned\n")
+            if hs['mtf_alignment']['failed_filters']:
+                parts.append("  - Failed filters:\n")
+                parts.extend(f"    - {name}: {count}\n" for name, count in hs['mtf_alignment']['failed_filters'].items())
+            parts.append(f"- **Relative Strength**: {hs['relative_strength']['detected']}/{hs['relative_strength']['analyzed']} confirmed\n")
+            if hs['relative_strength']['failed_filters']:
+                parts.append("  - Failed filters:\n")
+                parts.extend(f"    - {name}: {count}\n" for name, count in hs['relative_strength']['failed_filters'].items())
+            parts.append(f"- **Funding Extremes**: {hs['funding_extremes']['detected']}/{hs['funding_extremes']['analyzed']} extreme detected\n")
+            parts.append(f"  - 🔥 Extreme zScore bypass: {hs['funding_extremes']['extreme_zscore_bypass']}\n")
+            if hs['funding_extremes']['failed_filters']:
+                parts.append("  - Failed filters:\n")
+                parts.extend(f"    - {name}: {count}\n" for name, count in hs['funding_extremes']['failed_filters'].items())
+            parts.append(f"- **Signals Generated**: {hs['signals_generated']}\n\n")
+
+            # Box Range
+            parts.append("### 📦 Box Range Strategy\n\n")
+            br = stats['box_range']
+            parts.append(f"- **Boxes Detected**: {br['boxes_detected']}\n")
+            if br['box_grades']:
+                parts.append("  - Grades:\n")
+                parts.extend(f"    - Grade {grade}: {count}\n" for grade, count in sorted(br['box_grades'].items()))
+            parts.append(f"- **Entry Analysis**: {br['entry_analysis']['generated']}/{br['entry_analysis']['analyzed']} signals\n")
+            if br['failed_filters']:
+                parts.append("  - Failed filters:\n")
+                parts.extend(f"    - {name}: {count}\n" for name, count in br['failed_filters'].items())
+            parts.append(f"- **Signals Generated**: {br['signals_generated']}\n\n")
+
+            # Orders
+            parts.append("### 📊 Trading Activity\n\n")
+            orders = stats['orders']
+            parts.append(f"- Orders Placed: {orders['orders_placed']}\n")
+            parts.append(f"- Orders Filled: {orders['orders_filled']}\n")
+            parts.append(f"- Positions Opened: {orders['positions_opened']}\n")
+            parts.append(f"- Positions Closed: {orders['positions_closed']}\n\n")
+
+            # Errors
+            errs = stats['errors']
+            if errs['error_count'] > 0 or errs['warning_count'] > 0:
+                parts.append("### ⚠️ Errors & Warnings\n\n")
+                parts.append(f"- Errors: {errs['error_count']}\n")
+                parts.append(f"- Warnings: {errs['warning_count']}\n")
+                if errs['errors']:
+                    parts.append("\nRecent errors:\n")
+                    parts.extend(f"```\n{err.decode('utf-8', 'ignore')}\n```\n" for err in errs['errors'][:5])
+                parts.append("\n")
+
+            parts.append("---\n\n")
+
+            self._report_fp.write(''.join(parts))
+            self._report_fp.flush()
 
             print(f"✅ [{datetime.now().strftime('%H:%M:%S')}] Report updated: Scan #{self.iteration + 1}")
 
@@ -363,39 +598,63 @@ class TradeMonitor:
         print(f"⏱️  Check interval: {CHECK_INTERVAL // 60} minutes")
         print(f"🔍 Monitoring for errors and generating statistics...\n")
 
-        while True:
-            try:
-                # 새 로그 읽기
-                content = self.read_new_logs()
+        # 로그 쓰기마다 깨어나 새 줄을 바로 오류 체크하고, 카운트는 리포트 주기 동안 누적
+        self._log_watch = self.watch_log()
+        counts = defaultdict(Counter)
+        samples = defaultdict(list)
+        has_new_logs = False
+        next_report = time.monotonic()
+        try:
+            while True:
+                try:
+                    # 새 로그를 줄 단위 청크로 스트리밍하며 병렬로 오류 체크 및 카운트 누적
+                    has_error = False
+                    for has_error, error_pattern, chunk_counts, chunk_samples in self.scan_chunks(self.iter_new_lines()):
+                        has_new_logs = True
+                        if has_error:
+                            break
+                        for key, counter in chunk_counts.items():
+                            counts[key].update(counter)
+                        for key, lines in chunk_samples.items():
+                            samples[key].extend(lines[:10 - len(samples[key])])  # 최대 10개만
 
-                if content:
-                    # 오류 체크
-                    has_error, error_pattern = self.check_for_errors(content)
                     if has_error:
                         print(f"\n❌ CRITICAL ERROR DETECTED: {error_pattern}")
                         self.stop_server()
                         print(f"💾 Final report saved to: {REPORT_FILE}")
                         break
 
-                    # 통계 분석
-                    stats = self.analyze_logs(content)
-
-                    # 리포트 작성
-                    self.write_report(stats)
-
-                    self.iteration += 1
-
-                # 다음 체크까지 대기
-                time.sleep(CHECK_INTERVAL)
-
-            except KeyboardInterrupt:
-                print(f"\n\n🛑 Monitor stopped by user")
-                print(f"💾 Report saved to: {REPORT_FILE}")
-                break
-            except Exception as e:
-                print(f"\n❌ Unexpected error: {e}")
-                self.stop_server()
-                break
+                    if time.monotonic() >= next_report:
+                        if has_new_logs:
+                            # 통계 분석
+                            stats = self.analyze_logs(counts, samples)
+
+                            # 리포트 작성
+                            self.write_report(stats)
+
+                            self.iteration += 1
+                            counts = defaultdict(Counter)
+                            samples = defaultdict(list)
+                            has_new_logs = False
+                        next_report = time.monotonic() + CHECK_INTERVAL
+
+                    # 새 로그 쓰기 또는 다음 리포트 시각까지 대기
+                    self.wait_for_log(max(0, next_report - time.monotonic()))
+
+                except KeyboardInterrupt:
+                    print(f"\n\n🛑 Monitor stopped by user")
+                    print(f"💾 Report saved to: {REPORT_FILE}")
+                    break
+                except Exception as e:
+                    print(f"\n❌ Unexpected error: {e}")
+                    self.stop_server()
+                    break
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown(cancel_futures=True)
+            if self._report_fp is not None:
+                self._report_fp.close()
+            self.unwatch_log()
 
 if __name__ == '__main__':
     monitor = TradeMonitor()